@@ -1,14 +1,24 @@
-from sqlalchemy import create_engine, func
+from sqlalchemy import func, select, bindparam
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import csv
 import getpass
+import hashlib
+import hmac
+import io
+import os
+import re
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from models import Base, Member, Trainer, Admin, FitnessGoal, HealthMetric, Room, Class, PTSession, ClassEnrollment
+if __package__:
+    from ..models import make_engine, copy_csv, ensure_health_metric_partitions, ensure_partitions_for_rows, ENROLLMENT_TRAINER_SQL, ENROLLMENT_TRAINER_MIGRATION_SQL, latest_metric_stmt, Base, Member, Trainer, Admin, FitnessGoal, HealthMetric, Room, Class, PTSession, ClassEnrollment
+else:
+    # Run directly as a script (py app/main.py): make the sibling models package importable
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from models import make_engine, copy_csv, ensure_health_metric_partitions, ensure_partitions_for_rows, ENROLLMENT_TRAINER_SQL, ENROLLMENT_TRAINER_MIGRATION_SQL, latest_metric_stmt, Base, Member, Trainer, Admin, FitnessGoal, HealthMetric, Room, Class, PTSession, ClassEnrollment
 
 DB_NAME = "fitness_club"
 DB_USER = "postgres"
@@ -16,23 +26,81 @@ DB_PASSWORD = "123456"
 DB_HOST = "localhost"
 DB_PORT = "5432"
 
+# scrypt cost tuned for roughly 50ms per hash; admin login is rare
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+# hash_password('admin123'), computed once so startup doesn't run scrypt for a row that
+# almost always exists already
+DEFAULT_ADMIN_PASSWORD_HASH = (
+    "scrypt$16384$8$1$17f0e2b0c28da337ebdbd2999ddf95dd$"
+    "608411b1186bcc126d3b2036d65cc767183744c1b04cdd4f3e6682fc985b83b2"
+)
+
+BULK_PAGE_SIZE = 1000
+COPY_THRESHOLD = 100
+# HealthMetric monthly partitions created ahead of time at startup; imports add their own range
+PARTITION_MONTHS_AHEAD = 12
+
+# Rows fetched per round-trip from the server-side cursor in list views
+STREAM_BATCH_SIZE = 100
+
+MIN_TRIGRAM_SEARCH_LENGTH = 3
+SHORT_SEARCH_LIMIT = 50
+
+_ENGINE = None
+_SESSION_FACTORY = None
+
+# Hot non-primary-key lookup, built once so every call hits the same compiled-cache entry;
+# primary-key lookups go through session.get() and the identity map instead
+ADMIN_BY_USERNAME_STMT = select(Admin).where(Admin.username == bindparam('username'))
+
+
+_DATETIME_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2})')
+
+
+def _parse_dt(value):
+    # "YYYY-MM-DD HH:MM" without strptime's per-call format parsing; like strptime,
+    # month, day, hour and minute may be one or two digits
+    match = _DATETIME_RE.fullmatch(value)
+    if match is None:
+        raise ValueError(f"time data {value!r} does not match format 'YYYY-MM-DD HH:MM'")
+    return datetime(*map(int, match.groups()))
+
 
 def get_engine():
-    global DB_PASSWORD
+    global DB_PASSWORD, _ENGINE
+    if _ENGINE is not None:
+        return _ENGINE
+
     if DB_PASSWORD == "":
         DB_PASSWORD = getpass.getpass("PostgreSQL password: ")
     
-    connection_string = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    return create_engine(connection_string)
+    connection_string = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    # One process-wide pool. The interactive CLI only ever needs one connection,
+    # but front-ends reusing these functions share this pool.
+    _ENGINE = make_engine(connection_string)
+    return _ENGINE
 
 
 def get_session():
-    engine = get_engine()
-    Session = sessionmaker(bind=engine)
-    return Session()
+    global _SESSION_FACTORY
+    if _SESSION_FACTORY is None:
+        _SESSION_FACTORY = sessionmaker(bind=get_engine(), expire_on_commit=False)
+    return _SESSION_FACTORY()
+
 
+def dispose_engine():
+    # Drop the cached engine so the next get_engine() call builds a fresh pool
+    global _ENGINE, _SESSION_FACTORY
+    if _ENGINE is not None:
+        _ENGINE.dispose()
+    _ENGINE = None
+    _SESSION_FACTORY = None
 
-def drop_all_tables():
+
+def drop_all_tables(safe=False):
     engine = get_engine()
     print("WARNING: dropping all database tables...")
     confirm = input("Are you sure you want to delete all tables? (yes/no): ")
@@ -41,15 +109,27 @@ def drop_all_tables():
         return False
     
     try:
-        from sqlalchemy import text
-        with engine.connect() as conn:
-            try:
-                conn.execute(text("DROP INDEX IF EXISTS idx_ptsession_trainer_time CASCADE"))
-                conn.commit()
-            except Exception:
-                pass
-
-        Base.metadata.drop_all(engine)
+        if safe:
+            # Table-by-table drop for roles without privileges on the public schema. The view
+            # and trigger functions from create_view_and_trigger() depend on the tables, so
+            # they go first, in the same transaction.
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "DROP VIEW IF EXISTS MemberHealthSummary; "
+                    "DROP FUNCTION IF EXISTS check_class_capacity() CASCADE; "
+                    "DROP FUNCTION IF EXISTS set_enrollment_trainer() CASCADE; "
+                    "DROP FUNCTION IF EXISTS sync_class_trainer() CASCADE;"
+                )
+                Base.metadata.drop_all(conn)
+        else:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "DROP SCHEMA public CASCADE; "
+                    "CREATE SCHEMA public; "
+                    "GRANT ALL ON SCHEMA public TO CURRENT_USER;"
+                )
+        # Pooled connections may still hold plans and search_path state for the old schema
+        dispose_engine()
         print("All tables and indexes dropped successfully.")
         return True
     except Exception as e:
@@ -57,127 +137,154 @@ def drop_all_tables():
         return False
 
 
-def create_view_and_trigger(engine):
-    from sqlalchemy import text
-    
-    with engine.connect() as conn:
-        view_sql = """
-        CREATE OR REPLACE VIEW MemberHealthSummary AS
-        SELECT
-            m.member_id,
-            m.name AS member_name,
-            m.email,
-            hm.metric_type,
-            hm.metric_value,
-            hm.timestamp AS last_metric_time
-        FROM Member m
-        LEFT JOIN LATERAL (
-            SELECT *
-            FROM HealthMetric h
-            WHERE h.member_id = m.member_id
-            ORDER BY h.timestamp DESC
-            LIMIT 1
-        ) hm ON TRUE;
-        """
+def create_view_and_trigger(conn, enrollment_triggers=True):
+    view_sql = """
+    CREATE OR REPLACE VIEW MemberHealthSummary AS
+    SELECT
+        m.member_id,
+        m.name AS member_name,
+        m.email,
+        hm.metric_type,
+        hm.metric_value,
+        hm.timestamp AS last_metric_time
+    FROM "Member" m
+    LEFT JOIN LATERAL (
+        SELECT *
+        FROM "HealthMetric" h
+        WHERE h.member_id = m.member_id
+        ORDER BY h.timestamp DESC
+        LIMIT 1
+    ) hm ON TRUE;
+    """
+
+    trigger_function_sql = """
+    CREATE OR REPLACE FUNCTION check_class_capacity()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        room_capacity INT;
+    BEGIN
+        SELECT capacity INTO room_capacity
+        FROM "Room"
+        WHERE room_id = NEW.room_id;
         
-        try:
-            conn.execute(text(view_sql))
-            conn.commit()
-            print("Database view 'MemberHealthSummary' created successfully.")
-        except Exception as e:
-            if "already exists" not in str(e).lower():
-                print(f"View creation error: {e}")
-
-        trigger_function_sql = """
-        CREATE OR REPLACE FUNCTION check_class_capacity()
-        RETURNS TRIGGER AS $$
-        DECLARE
-            room_capacity INT;
-        BEGIN
-            SELECT capacity INTO room_capacity
-            FROM Room
-            WHERE room_id = NEW.room_id;
-            
-            IF NEW.capacity > room_capacity THEN
-                RAISE EXCEPTION 'Class capacity (%) cannot exceed room capacity (%)', NEW.capacity, room_capacity;
-            END IF;
-            
-            RETURN NEW;
-        END;
-        $$ LANGUAGE plpgsql;
-        """
+        IF NEW.capacity > room_capacity THEN
+            RAISE EXCEPTION 'Class capacity (%) cannot exceed room capacity (%)', NEW.capacity, room_capacity;
+        END IF;
         
-        try:
-            conn.execute(text(trigger_function_sql))
-            conn.commit()
-        except Exception:
-            pass
-
-        trigger_sql = """
-        DROP TRIGGER IF EXISTS trg_check_class_capacity ON "Class";
-        
-        CREATE TRIGGER trg_check_class_capacity
-        BEFORE INSERT OR UPDATE ON "Class"
-        FOR EACH ROW
-        EXECUTE FUNCTION check_class_capacity();
-        """
-        
-        try:
-            conn.execute(text(trigger_sql))
-            conn.commit()
-            print("Database trigger 'trg_check_class_capacity' created successfully.")
-        except Exception:
-            pass
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    trigger_sql = """
+    DROP TRIGGER IF EXISTS trg_check_class_capacity ON "Class";
+    
+    CREATE TRIGGER trg_check_class_capacity
+    BEFORE INSERT OR UPDATE ON "Class"
+    FOR EACH ROW
+    EXECUTE FUNCTION check_class_capacity();
+    """
+
+    # Sent as one simple-query batch; no_parameters keeps psycopg2 from treating % as a placeholder.
+    # The enrollment triggers are skipped when ClassEnrollment was just created, since its
+    # after_create event has already installed them.
+    ddl = view_sql + trigger_function_sql + trigger_sql
+    if enrollment_triggers:
+        ddl += ENROLLMENT_TRAINER_SQL
+    conn.exec_driver_sql(ddl, execution_options={'no_parameters': True})
+    print("Database view 'MemberHealthSummary' and triggers created successfully.")
 
 
 def create_tables():
     engine = get_engine()
-    from sqlalchemy import inspect, text
+    from sqlalchemy import inspect
+    # Catalog lookups up front; create_all below is limited to the tables found missing
     inspector = inspect(engine)
-    existing_tables = inspector.get_table_names()
+    existing_tables = set(inspector.get_table_names())
     required_tables = ['Member', 'Trainer', 'Admin', 'Room', 'Class', 'FitnessGoal', 'HealthMetric', 'PTSession', 'ClassEnrollment']
     missing_tables = [t for t in required_tables if t not in existing_tables]
-    
-    if missing_tables:
-        print("Creating database tables from ORM models...")
-        print("Missing tables: " + ", ".join(missing_tables))
+    # ClassEnrollment from before the denormalized trainer_id column needs a one-off upgrade
+    needs_enrollment_trainer = 'ClassEnrollment' in existing_tables and 'trainer_id' not in {
+        col['name'] for col in inspector.get_columns('ClassEnrollment')
+    }
+    
+    # Tables, view and trigger are created in a single transaction so a failure
+    # part-way through leaves the schema untouched
+    with engine.begin() as conn:
+        if missing_tables:
+            print("Creating database tables from ORM models...")
+            print("Missing tables: " + ", ".join(missing_tables))
+
+            conn.exec_driver_sql("DROP INDEX IF EXISTS idx_ptsession_trainer_time")
+            # checkfirst stays on: the pt_session_status type is created by a metadata-level
+            # hook that fires whichever tables are passed, and may already exist
+            Base.metadata.create_all(
+                conn,
+                tables=[Base.metadata.tables[t] for t in missing_tables],
+                checkfirst=True,
+            )
+            print("All database tables created successfully.")
+        else:
+            print("All required tables already exist.")
 
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("DROP INDEX IF EXISTS idx_ptsession_trainer_time"))
-                conn.commit()
-        except Exception:
-            pass
+        if needs_enrollment_trainer:
+            print("Adding and backfilling ClassEnrollment.trainer_id...")
+            conn.exec_driver_sql(ENROLLMENT_TRAINER_MIGRATION_SQL)
 
-        try:
-            Base.metadata.create_all(engine, checkfirst=True)
-            inspector = inspect(engine)
-            new_tables = inspector.get_table_names()
-            still_missing = [t for t in required_tables if t not in new_tables]
-            
-            if not still_missing:
-                print("All database tables created successfully.")
-            else:
-                print(f"Warning: Some tables still missing: {still_missing}")
-                raise Exception(f"Failed to create tables: {still_missing}")
-        except Exception as e:
-            error_str = str(e).lower()
-            if "already exists" in error_str or "duplicate" in error_str:
-                inspector = inspect(engine)
-                new_tables = inspector.get_table_names()
-                still_missing = [t for t in required_tables if t not in new_tables]
-                if not still_missing:
-                    print("Tables created (some indexes or constraints may have been created previously).")
-                else:
-                    print(f"Warning: Some tables still missing: {still_missing}")
-                    raise
-            else:
-                raise
+        today = date.today()
+        ensure_health_metric_partitions(conn, today, today + timedelta(days=31 * PARTITION_MONTHS_AHEAD))
+
+        print("Creating database view and trigger...")
+        create_view_and_trigger(conn, enrollment_triggers='ClassEnrollment' not in missing_tables)
+
+
+def register_members_bulk(session, rows):
+    return Member.bulk_insert(session, rows, batch_size=BULK_PAGE_SIZE)
+
+
+def add_health_metrics_bulk(session, rows):
+    return HealthMetric.bulk_insert(session, rows, batch_size=BULK_PAGE_SIZE)
+
+
+def enroll_members_bulk(session, rows):
+    return ClassEnrollment.bulk_insert(session, rows, batch_size=BULK_PAGE_SIZE)
+
+
+def bulk_load_copy(session, model, columns, rows):
+    # Stream rows through COPY on the session's own connection so the load
+    # commits (or rolls back) together with the rest of the transaction.
+    # COPY reads an empty field as NULL, so each column list only names the keys the
+    # rows actually carry; omitted columns get their server default, as with INSERT.
+    ensure_partitions_for_rows(session.connection(), model, rows)
+
+    groups = {}
+    for row in rows:
+        present = tuple(col for col in columns if col in row)
+        groups.setdefault(present, []).append(row)
+
+    dbapi_conn = session.connection().connection
+    for present, group in groups.items():
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in group:
+            writer.writerow([row[col] for col in present])
+        buf.seek(0)
+
+        copy_csv(dbapi_conn, model, present, buf)
+
+
+def import_health_metrics(session, rows):
+    if len(rows) < COPY_THRESHOLD:
+        add_health_metrics_bulk(session, rows)
     else:
-        print("All required tables already exist.")
+        bulk_load_copy(session, HealthMetric, ('member_id', 'metric_type', 'metric_value', 'timestamp'), rows)
 
-    print("Creating database view and trigger...")
-    create_view_and_trigger(engine)
+
+def import_enrollments(session, rows):
+    if len(rows) < COPY_THRESHOLD:
+        enroll_members_bulk(session, rows)
+    else:
+        bulk_load_copy(session, ClassEnrollment, ('member_id', 'class_id', 'enrollment_date'), rows)
 
 
 def register_member(session):
@@ -191,21 +298,20 @@ def register_member(session):
     dob = None
     if dob_str:
         try:
-            dob = datetime.strptime(dob_str, "%Y-%m-%d").date()
+            dob = date.fromisoformat(dob_str)
         except ValueError:
             print("Invalid date format. Member registered without date of birth.")
     
     try:
-        member = Member(
-            name=name,
-            email=email,
-            date_of_birth=dob,
-            gender=gender,
-            phone=phone
-        )
-        session.add(member)
+        [member_id] = register_members_bulk(session, [{
+            'name': name,
+            'email': email,
+            'date_of_birth': dob,
+            'gender': gender,
+            'phone': phone
+        }])
         session.commit()
-        print(f"Member registered with ID: {member.member_id}")
+        print(f"Member registered with ID: {member_id}")
     except IntegrityError as e:
         session.rollback()
         print(f"Error registering member: {str(e)}")
@@ -217,7 +323,7 @@ def register_member(session):
 def update_member_profile(session):
     print("\n=== Update Member Profile ===")
     member_id = int(input("Member ID: "))
-    member = session.query(Member).filter(Member.member_id == member_id).first()
+    member = session.get(Member, member_id)
     if not member:
         print("Member not found.")
         return
@@ -254,19 +360,17 @@ def add_health_metric(session):
     metric_type = input("Metric type (e.g., 'Weight (kg)'): ")
     metric_value = float(input("Metric value: "))
 
-    member = session.query(Member).filter(Member.member_id == member_id).first()
+    member = session.get(Member, member_id)
     if not member:
         print("Member not found.")
         return
     
     try:
-        metric = HealthMetric(
-            member_id=member_id,
-            metric_type=metric_type,
-            metric_value=metric_value,
-            timestamp=datetime.now()
-        )
-        session.add(metric)
+        add_health_metrics_bulk(session, [{
+            'member_id': member_id,
+            'metric_type': metric_type,
+            'metric_value': metric_value
+        }])
         session.commit()
         print("Metric recorded.")
     except Exception as e:
@@ -291,7 +395,7 @@ def book_pt_session(session):
     session_time_str = input("Session time (YYYY-MM-DD HH:MM): ")
     
     try:
-        session_time = datetime.strptime(session_time_str, "%Y-%m-%d %H:%M")
+        session_time = _parse_dt(session_time_str)
     except ValueError:
         print("Invalid date/time format. Please use YYYY-MM-DD HH:MM")
         return
@@ -300,8 +404,7 @@ def book_pt_session(session):
         pt_session = PTSession(
             member_id=member_id,
             trainer_id=trainer_id,
-            session_time=session_time,
-            status='scheduled'
+            session_time=session_time
         )
         session.add(pt_session)
         session.commit()
@@ -315,36 +418,50 @@ def book_pt_session(session):
         print(f"Unexpected error: {str(e)}")
 
 
+def class_listing_query(session):
+    # One row per class with its trainer, room and enrollment count. Joins go through the
+    # relationships: ClassEnrollment also has a trainer_id FK, so a bare outerjoin would
+    # match on the trainer instead of the class
+    return session.query(
+        Class.class_id,
+        Class.class_name,
+        Class.class_time,
+        Class.capacity,
+        Trainer.name.label('trainer_name'),
+        Room.name.label('room_name'),
+        func.count(ClassEnrollment.enrollment_id).label('enrolled'),
+    ).join(Class.room).join(Class.trainer).outerjoin(Class.enrollments).group_by(
+        Class.class_id, Trainer.name, Room.name
+    )
+
+
 def view_available_classes(session):
     print("\n=== Available Classes ===")
     
-    classes = session.query(Class).join(Room).join(Trainer).order_by(Class.class_time).all()
-    
-    if not classes:
-        print("No classes available.")
-        return
-    
-    print(f"\n{'ID':<6} {'Class Name':<25} {'Time':<20} {'Trainer':<20} {'Room':<15} {'Enrolled':<10} {'Capacity':<10}")
-    print("-" * 110)
+    classes = class_listing_query(session).order_by(Class.class_time).yield_per(STREAM_BATCH_SIZE)
     
-    for class_obj in classes:
-        # Count current enrollments
-        enrollment_count = session.query(ClassEnrollment).filter(
-            ClassEnrollment.class_id == class_obj.class_id
-        ).count()
+    found = False
+    for row in classes:
+        if not found:
+            print(f"\n{'ID':<6} {'Class Name':<25} {'Time':<20} {'Trainer':<20} {'Room':<15} {'Enrolled':<10} {'Capacity':<10}")
+            print("-" * 110)
+            found = True
         
-        spaces_available = class_obj.capacity - enrollment_count
+        spaces_available = row.capacity - row.enrolled
         status = "FULL" if spaces_available == 0 else f"{spaces_available} spots"
         
         print(
-            f"{class_obj.class_id:<6} "
-            f"{class_obj.class_name[:24]:<25} "
-            f"{str(class_obj.class_time):<20} "
-            f"{class_obj.trainer.name[:19]:<20} "
-            f"{class_obj.room.name[:14]:<15} "
-            f"{enrollment_count}/{class_obj.capacity:<10} "
+            f"{row.class_id:<6} "
+            f"{row.class_name[:24]:<25} "
+            f"{str(row.class_time):<20} "
+            f"{row.trainer_name[:19]:<20} "
+            f"{row.room_name[:14]:<15} "
+            f"{row.enrolled}/{row.capacity:<10} "
             f"{status:<10}"
         )
+    
+    if not found:
+        print("No classes available.")
 
 
 def signup_for_class(session):
@@ -356,7 +473,7 @@ def signup_for_class(session):
         print("Invalid member ID. Please enter a number.")
         return
     
-    member = session.query(Member).filter(Member.member_id == member_id).first()
+    member = session.get(Member, member_id)
     if not member:
         print("Member not found.")
         return
@@ -369,42 +486,36 @@ def signup_for_class(session):
         print("Invalid class ID. Please enter a number.")
         return
     
-    class_obj = session.query(Class).filter(Class.class_id == class_id).first()
-    if not class_obj:
+    # Class details, current enrollment count and duplicate check in one round-trip
+    class_row = class_listing_query(session).add_columns(
+        func.bool_or(ClassEnrollment.member_id == member_id).label('already_enrolled')
+    ).filter(Class.class_id == class_id).first()
+    if not class_row:
         print("Class not found.")
         return
     
-    existing_enrollment = session.query(ClassEnrollment).filter(
-        ClassEnrollment.member_id == member_id,
-        ClassEnrollment.class_id == class_id
-    ).first()
-    
-    if existing_enrollment:
+    if class_row.already_enrolled:
         print(f"You are already enrolled in this class.")
         return
     
-    enrollment_count = session.query(ClassEnrollment).filter(
-        ClassEnrollment.class_id == class_id
-    ).count()
+    enrollment_count = class_row.enrolled
     
-    if enrollment_count >= class_obj.capacity:
-        print(f"Class is full. Capacity: {class_obj.capacity}, Enrolled: {enrollment_count}")
+    if enrollment_count >= class_row.capacity:
+        print(f"Class is full. Capacity: {class_row.capacity}, Enrolled: {enrollment_count}")
         return
     
     try:
-        enrollment = ClassEnrollment(
-            member_id=member_id,
-            class_id=class_id,
-            enrollment_date=datetime.now()
-        )
-        session.add(enrollment)
+        enroll_members_bulk(session, [{
+            'member_id': member_id,
+            'class_id': class_id
+        }])
         session.commit()
         
-        spaces_remaining = class_obj.capacity - enrollment_count - 1
-        print(f"\n Successfully enrolled in '{class_obj.class_name}'!")
-        print(f"  Class time: {class_obj.class_time}")
-        print(f"  Trainer: {class_obj.trainer.name}")
-        print(f"  Room: {class_obj.room.name}")
+        spaces_remaining = class_row.capacity - enrollment_count - 1
+        print(f"\n Successfully enrolled in '{class_row.class_name}'!")
+        print(f"  Class time: {class_row.class_time}")
+        print(f"  Trainer: {class_row.trainer_name}")
+        print(f"  Room: {class_row.room_name}")
         print(f"  Spaces remaining: {spaces_remaining}")
     except IntegrityError as e:
         session.rollback()
@@ -419,37 +530,49 @@ def view_trainer_schedule(session):
     print("\n=== Trainer Schedule ===")
     trainer_id = int(input("Trainer ID: "))
     
-    trainer = session.query(Trainer).filter(Trainer.trainer_id == trainer_id).first()
+    trainer = session.get(Trainer, trainer_id)
     if not trainer:
         print("Trainer not found.")
         return
     
     print("\n-- PT Sessions --")
-    pt_sessions = session.query(PTSession).join(Member).filter(
+    pt_sessions = session.query(
+        PTSession.session_id,
+        PTSession.session_time,
+        PTSession.status,
+        Member.name.label('member_name'),
+    ).join(Member).filter(
         PTSession.trainer_id == trainer_id
-    ).order_by(PTSession.session_time).all()
+    ).order_by(PTSession.session_time).yield_per(STREAM_BATCH_SIZE)
     
-    if pt_sessions:
-        for pt_session in pt_sessions:
-            print(
-                f"Session {pt_session.session_id} | {pt_session.session_time} | "
-                f"Member: {pt_session.member.name} | Status: {pt_session.status}"
-            )
-    else:
+    found = False
+    for row in pt_sessions:
+        found = True
+        print(
+            f"Session {row.session_id} | {row.session_time} | "
+            f"Member: {row.member_name} | Status: {row.status}"
+        )
+    if not found:
         print("No PT sessions scheduled.")
     
     print("\n-- Classes --")
-    classes = session.query(Class).join(Room).filter(
+    classes = session.query(
+        Class.class_id,
+        Class.class_time,
+        Class.class_name,
+        Room.name.label('room_name'),
+    ).join(Room).filter(
         Class.trainer_id == trainer_id
-    ).order_by(Class.class_time).all()
+    ).order_by(Class.class_time).yield_per(STREAM_BATCH_SIZE)
     
-    if classes:
-        for class_obj in classes:
-            print(
-                f"Class {class_obj.class_id} | {class_obj.class_time} | "
-                f"{class_obj.class_name} @ {class_obj.room.name}"
-            )
-    else:
+    found = False
+    for row in classes:
+        found = True
+        print(
+            f"Class {row.class_id} | {row.class_time} | "
+            f"{row.class_name} @ {row.room_name}"
+        )
+    if not found:
         print("No classes scheduled.")
 
 
@@ -457,27 +580,30 @@ def member_lookup(session):
     print("\n=== Member Lookup (Trainer) ===")
     name_like = input("Search name (partial allowed): ")
     
-    members = session.query(Member).filter(
-        func.lower(Member.name).like(f"%{name_like.lower()}%")
-    ).all()
+    members_query = session.query(Member).filter(
+        Member.name.ilike(f"%{name_like}%")
+    )
+    # Trigram index can't narrow patterns shorter than 3 characters; bound the scan instead
+    if len(name_like) < MIN_TRIGRAM_SEARCH_LENGTH:
+        members_query = members_query.limit(SHORT_SEARCH_LIMIT)
+    
+    found = False
+    for member in members_query.yield_per(STREAM_BATCH_SIZE):
+        found = True
+        print(f"{member.member_id}: {member.name} ({member.email})")
     
-    if not members:
+    if not found:
         print("No members found.")
         return
     
-    for member in members:
-        print(f"{member.member_id}: {member.name} ({member.email})")
-    
     member_id = int(input("Enter Member ID to view details: "))
     
-    member = session.query(Member).filter(Member.member_id == member_id).first()
+    member = session.get(Member, member_id)
     if not member:
         print("Member not found.")
         return
     
-    latest_metric = session.query(HealthMetric).filter(
-        HealthMetric.member_id == member_id
-    ).order_by(HealthMetric.timestamp.desc()).first()
+    latest_metric = session.execute(latest_metric_stmt(member_id)).scalar_one_or_none()
     
     goals = session.query(FitnessGoal).filter(
         FitnessGoal.member_id == member_id
@@ -557,7 +683,7 @@ def create_class(session):
     capacity = int(input("Capacity: "))
     
     try:
-        class_time = datetime.strptime(class_time_str, "%Y-%m-%d %H:%M")
+        class_time = _parse_dt(class_time_str)
     except ValueError:
         print("Invalid date/time format. Please use YYYY-MM-DD HH:MM")
         return
@@ -628,14 +754,40 @@ def trainer_menu(session):
             print("Invalid choice.")
 
 
+def hash_password(password):
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_DKLEN)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password, stored_hash):
+    if not stored_hash.startswith("scrypt$"):
+        # Legacy plaintext row from before passwords were hashed
+        return hmac.compare_digest(password.encode(), stored_hash.encode())
+
+    try:
+        _, n, r, p, salt_hex, digest_hex = stored_hash.split("$")
+        expected = bytes.fromhex(digest_hex)
+        digest = hashlib.scrypt(
+            password.encode(), salt=bytes.fromhex(salt_hex), n=int(n), r=int(r), p=int(p), dklen=len(expected)
+        )
+    except ValueError:
+        # Malformed hash (bad field count, non-hex salt/digest, invalid cost parameters): no match
+        return False
+    return hmac.compare_digest(digest, expected)
+
+
 def authenticate_admin(session):
     print("\n=== Admin Authentication ===")
     username = input("Username: ")
     password = input("Password: ")
     
-    admin = session.query(Admin).filter(Admin.username == username).first()
+    admin = session.execute(ADMIN_BY_USERNAME_STMT, {'username': username}).scalar_one_or_none()
     
-    if admin and admin.password_hash == password:
+    if admin and verify_password(password, admin.password_hash):
+        if not admin.password_hash.startswith("scrypt$"):
+            admin.password_hash = hash_password(password)
+            session.commit()
         print(f"Authenticated as {admin.name}")
         return admin
     else:
@@ -644,16 +796,15 @@ def authenticate_admin(session):
 
 
 def create_default_admin(session):
-    admin = session.query(Admin).filter(Admin.username == 'admin').first()
-    if not admin:
-        default_admin = Admin(
-            username='admin',
-            password_hash='admin123',
-            name='System Administrator',
-            email='admin@fitnessclub.com'
-        )
-        session.add(default_admin)
-        session.commit()
+    stmt = pg_insert(Admin.__table__).values(
+        username='admin',
+        password_hash=DEFAULT_ADMIN_PASSWORD_HASH,
+        name='System Administrator',
+        email='admin@fitnessclub.com'
+    ).on_conflict_do_nothing(index_elements=['username'])
+    result = session.execute(stmt)
+    session.commit()
+    if result.rowcount:
         print("Default admin account created (username: admin, password: admin123).")
 
 
@@ -733,7 +884,7 @@ if __name__ == "__main__":
     import sys
     
     if len(sys.argv) > 1 and sys.argv[1] == "--drop-tables":
-        drop_all_tables()
+        drop_all_tables(safe="--safe" in sys.argv[2:])
         print("\nTables dropped Run the application again to create them fresh.")
     else:
         main_menu()
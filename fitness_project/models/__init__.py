@@ -1,5 +1,15 @@
 
 from .models import (
+    make_engine,
+    copy_csv,
+    seed_from_csv,
+    ensure_health_metric_partitions,
+    ensure_partitions_for_rows,
+    ENROLLMENT_TRAINER_SQL,
+    ENROLLMENT_TRAINER_MIGRATION_SQL,
+    latest_metric_stmt,
+    member_metrics_stmt,
+    upcoming_sessions_stmt,
     Base,
     Member,
     Trainer,
@@ -13,6 +23,16 @@ from .models import (
 )
 
 __all__ = [
+    'make_engine',
+    'copy_csv',
+    'seed_from_csv',
+    'ensure_health_metric_partitions',
+    'ensure_partitions_for_rows',
+    'ENROLLMENT_TRAINER_SQL',
+    'ENROLLMENT_TRAINER_MIGRATION_SQL',
+    'latest_metric_stmt',
+    'member_metrics_stmt',
+    'upcoming_sessions_stmt',
     'Base',
     'Member',
     'Trainer',
@@ -1,174 +1,502 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Numeric, ForeignKey, CheckConstraint, UniqueConstraint, Index
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from datetime import datetime
+import csv
+import logging
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import List, Optional
 
-Base = declarative_base()
+from sqlalchemy import create_engine, insert, inspect, lambda_stmt, select, Integer, String, Date, DateTime, Enum, Numeric, ForeignKey, CheckConstraint, UniqueConstraint, Index, DDL, FetchedValue, event, func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, mapped_column, relationship, selectinload
 
 
-class Member(Base):
-    __tablename__ = 'Member'
-    
-    member_id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(100), nullable=False)
-    email = Column(String(100), unique=True, nullable=False)
-    date_of_birth = Column(Date, nullable=True)
-    gender = Column(String(10), nullable=True)
-    phone = Column(String(20), nullable=True)
-    
-   
-    fitness_goals = relationship("FitnessGoal", back_populates="member", cascade="all, delete-orphan")
-    health_metrics = relationship("HealthMetric", back_populates="member", cascade="all, delete-orphan")
-    pt_sessions = relationship("PTSession", back_populates="member", cascade="all, delete-orphan")
-    class_enrollments = relationship("ClassEnrollment", back_populates="member", cascade="all, delete-orphan")
-    
+logger = logging.getLogger(__name__)
+
+# SQLSTATE raised when a new partition's range overlaps rows already in the default partition
+CHECK_VIOLATION = '23514'
+
+
+class Base(MappedAsDataclass, DeclarativeBase, kw_only=True, repr=False, eq=False):
+    # Dataclass __init__ is generated once per class; repr comes from ReprMixin and
+    # equality stays identity-based, as the session expects
+    pass
+
+
+# Trigram operator classes used by ix_member_name_trgm must exist before the tables
+event.listen(
+    Base.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'),
+)
+
+def make_engine(url, concurrency=25):
+    # Pool sized to the expected number of concurrent callers (25-50 is the usual
+    # sweet spot, capped by max_connections / number_of_app_processes) so nothing
+    # ends up on the default pool_size=5. The executemany options are psycopg2-specific.
+    return create_engine(
+        url,
+        pool_size=concurrency,
+        max_overflow=concurrency,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        insertmanyvalues_page_size=1000,
+        executemany_mode='values_plus_batch',
+        executemany_batch_page_size=500,
+    )
+
+
+_PG_DIALECT = postgresql.dialect()
+
+
+def copy_csv(dbapi_conn, model, columns, csv_file):
+    # COPY ... FROM STDIN skips per-row parse/plan; the server reads the CSV stream directly.
+    # Column names may come from a CSV header, so they are checked against the table and
+    # quoted before going into the statement.
+    table = model.__table__
+    unknown = [col for col in columns if col not in table.c]
+    if unknown:
+        raise ValueError(f"Unknown {table.name} columns: {', '.join(map(repr, unknown))}")
+
+    preparer = _PG_DIALECT.identifier_preparer
+    column_list = ", ".join(preparer.quote(table.c[col].name) for col in columns)
+    with dbapi_conn.cursor() as cursor:
+        cursor.copy_expert(f'COPY {preparer.format_table(table)} ({column_list}) FROM STDIN WITH (FORMAT csv)', csv_file)
+
+
+def seed_from_csv(engine, model, path):
+    # The first line of the file names the columns being loaded. Partitioned models get
+    # a first pass over the data so their partitions exist before COPY.
+    with engine.begin() as conn, open(path, newline='') as csv_file:
+        columns = next(csv.reader([csv_file.readline()]))
+        data_start = csv_file.tell()
+        ensure_partitions_for_rows(conn, model, csv.DictReader(csv_file, fieldnames=columns))
+        csv_file.seek(data_start)
+        copy_csv(conn.connection, model, columns, csv_file)
+
+
+PT_SESSION_STATUS = Enum('scheduled', 'completed', 'cancelled', 'no_show', name='pt_session_status')
+
+
+class ReprMixin:
     def __repr__(self):
-        return f"<Member(id={self.member_id}, name='{self.name}', email='{self.email}')>"
+        # Identity key only, so logging an instance never triggers a load or refresh
+        return f"<{type(self).__name__} {inspect(self).identity}>"
+
 
+class BulkInsertMixin:
+    @classmethod
+    def bulk_insert(cls, session, rows, batch_size=1000):
+        # Plain dicts straight to INSERT ... VALUES (...), (...) RETURNING pk, skipping the unit of work.
+        # The SERIAL primary key serves as the insertmanyvalues sentinel, so returned ids
+        # come back in the same order as rows, batched, without per-row round-trips.
+        pk = cls.__mapper__.primary_key[0]
+        stmt = insert(cls).returning(pk, sort_by_parameter_order=True).execution_options(
+            insertmanyvalues_page_size=batch_size
+        )
+        ensure_partitions_for_rows(session.connection(), cls, rows)
+        return session.execute(stmt, rows).scalars().all()
+
+    @classmethod
+    def bulk_save(cls, session, rows, batch_size=1000):
+        # Long imports: insert and commit per batch to bound transaction/WAL size.
+        # rows may be any iterable (a generator, a csv.DictReader), consumed one batch at a time.
+        # Rows never enter the identity map; re-query if the objects are needed.
+        stmt = insert(cls).execution_options(insertmanyvalues_page_size=batch_size)
+        rows = iter(rows)
+        while batch := list(islice(rows, batch_size)):
+            ensure_partitions_for_rows(session.connection(), cls, batch)
+            session.execute(stmt, batch)
+            session.commit()
+
+
+class Member(BulkInsertMixin, ReprMixin, Base):
+    __tablename__ = 'Member'
 
-class Trainer(Base):
+    member_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    name: Mapped[str] = mapped_column(String(100))
+    email: Mapped[str] = mapped_column(String(100), unique=True)
+    date_of_birth: Mapped[Optional[date]] = mapped_column(Date, default=None)
+    gender: Mapped[Optional[str]] = mapped_column(String(10), default=None)
+    phone: Mapped[Optional[str]] = mapped_column(String(20), default=None)
+
+
+    fitness_goals: Mapped[List["FitnessGoal"]] = relationship(back_populates="member", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql", init=False)
+    health_metrics: Mapped[List["HealthMetric"]] = relationship(back_populates="member", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql", init=False)
+    pt_sessions: Mapped[List["PTSession"]] = relationship(back_populates="member", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql", init=False)
+    class_enrollments: Mapped[List["ClassEnrollment"]] = relationship(back_populates="member", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql", init=False)
+
+    @classmethod
+    def with_full_profile(cls):
+        # Loader options for select(Member).options(*Member.with_full_profile()): one IN-query per path
+        return (
+            selectinload(cls.fitness_goals),
+            selectinload(cls.health_metrics),
+            selectinload(cls.pt_sessions).selectinload(PTSession.trainer),
+            selectinload(cls.class_enrollments).selectinload(ClassEnrollment.class_obj),
+        )
+
+
+    __table_args__ = (
+        Index(
+            'ix_member_name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+    )
+
+
+class Trainer(ReprMixin, Base):
     __tablename__ = 'Trainer'
-    
-    trainer_id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(100), nullable=False)
-    email = Column(String(100), unique=True, nullable=False)
-    specialization = Column(String(100), nullable=True)
-    
-   
-    classes = relationship("Class", back_populates="trainer")
-    pt_sessions = relationship("PTSession", back_populates="trainer")
-    
-    def __repr__(self):
-        return f"<Trainer(id={self.trainer_id}, name='{self.name}', specialization='{self.specialization}')>"
+
+    trainer_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    name: Mapped[str] = mapped_column(String(100))
+    email: Mapped[str] = mapped_column(String(100), unique=True)
+    specialization: Mapped[Optional[str]] = mapped_column(String(50), default=None)
 
 
-class Admin(Base):
+    classes: Mapped[List["Class"]] = relationship(back_populates="trainer", lazy="raise_on_sql", init=False)
+    pt_sessions: Mapped[List["PTSession"]] = relationship(back_populates="trainer", lazy="raise_on_sql", init=False)
+
+    @classmethod
+    def with_schedule(cls):
+        return (
+            selectinload(cls.classes).selectinload(Class.room),
+            selectinload(cls.pt_sessions).selectinload(PTSession.member),
+        )
+
+
+class Admin(ReprMixin, Base):
     __tablename__ = 'Admin'
-    
-    admin_id = Column(Integer, primary_key=True, autoincrement=True)
-    username = Column(String(50), unique=True, nullable=False)
-    password_hash = Column(String(255), nullable=False)  # In production, use proper hashing
-    name = Column(String(100), nullable=False)
-    email = Column(String(100), unique=True, nullable=False)
-    
-    def __repr__(self):
-        return f"<Admin(id={self.admin_id}, username='{self.username}', name='{self.name}')>"
 
+    admin_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    username: Mapped[str] = mapped_column(String(50), unique=True)
+    password_hash: Mapped[str] = mapped_column(String(128))  # scrypt$n$r$p$salt$digest, 114 chars
+    name: Mapped[str] = mapped_column(String(100))
+    email: Mapped[str] = mapped_column(String(100), unique=True)
 
-class FitnessGoal(Base):
+
+    __table_args__ = (
+        # Login is an equality probe on username; the unique btree still enforces uniqueness
+        Index('ix_admin_username_hash', 'username', postgresql_using='hash'),
+    )
+
+
+class FitnessGoal(BulkInsertMixin, ReprMixin, Base):
     __tablename__ = 'FitnessGoal'
-    
-    goal_id = Column(Integer, primary_key=True, autoincrement=True)
-    member_id = Column(Integer, ForeignKey('Member.member_id', ondelete='CASCADE'), nullable=False)
-    goal_type = Column(String(50), nullable=False)
-    target_value = Column(Numeric(6, 2), nullable=True)
-    start_date = Column(Date, nullable=True)
-    end_date = Column(Date, nullable=True)
-    
-
-    member = relationship("Member", back_populates="fitness_goals")
-    
-    def __repr__(self):
-        return f"<FitnessGoal(id={self.goal_id}, member_id={self.member_id}, type='{self.goal_type}')>"
+
+    goal_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    member_id: Mapped[int] = mapped_column(Integer, ForeignKey('Member.member_id', ondelete='CASCADE'))
+    goal_type: Mapped[str] = mapped_column(String(50))
+    target_value: Mapped[Optional[float]] = mapped_column(Numeric(6, 2, asdecimal=False), default=None)
+    start_date: Mapped[Optional[date]] = mapped_column(Date, default=None)
+    end_date: Mapped[Optional[date]] = mapped_column(Date, default=None)
 
 
-class HealthMetric(Base):
+    member: Mapped["Member"] = relationship(back_populates="fitness_goals", lazy="raise_on_sql", init=False)
+
+
+    __table_args__ = (
+        CheckConstraint('end_date IS NULL OR end_date >= start_date', name='ck_goal_date_range'),
+    )
+
+
+class HealthMetric(BulkInsertMixin, ReprMixin, Base):
     __tablename__ = 'HealthMetric'
-    
-    metric_id = Column(Integer, primary_key=True, autoincrement=True)
-    member_id = Column(Integer, ForeignKey('Member.member_id', ondelete='CASCADE'), nullable=False)
-    metric_type = Column(String(50), nullable=False)
-    metric_value = Column(Numeric(6, 2), nullable=False)
-    timestamp = Column(DateTime, nullable=False, default=datetime.now)
-    
-   
-    member = relationship("Member", back_populates="health_metrics")
-    
-    def __repr__(self):
-        return f"<HealthMetric(id={self.metric_id}, member_id={self.member_id}, type='{self.metric_type}')>"
 
+    metric_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    member_id: Mapped[int] = mapped_column(Integer, ForeignKey('Member.member_id', ondelete='CASCADE'))
+    metric_type: Mapped[str] = mapped_column(String(50))
+    metric_value: Mapped[float] = mapped_column(Numeric(6, 2, asdecimal=False))
+    # Part of the primary key because the table is range-partitioned on it
+    timestamp: Mapped[datetime] = mapped_column(DateTime, primary_key=True, server_default=func.now(), init=False)
+
+
+    member: Mapped["Member"] = relationship(back_populates="health_metrics", lazy="raise_on_sql", init=False)
+
+
+    __table_args__ = (
+        CheckConstraint('metric_value >= 0', name='ck_metric_nonneg'),
+        # INCLUDE lets the latest-metric lookup run as an index-only scan
+        Index(
+            'ix_healthmetric_member_ts',
+            'member_id',
+            timestamp.column.desc(),
+            postgresql_include=['metric_id', 'metric_type', 'metric_value'],
+        ),
+        # Monthly partitions keep time-window reads to the chunks they cover;
+        # see ensure_health_metric_partitions()
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
+    )
+
+
+# Catch-all for rows outside any monthly partition, so inserts never fail for lack of one
+event.listen(
+    HealthMetric.__table__,
+    'after_create',
+    DDL('CREATE TABLE IF NOT EXISTS "HealthMetric_default" PARTITION OF "HealthMetric" DEFAULT').execute_if(dialect='postgresql'),
+)
 
-class Room(Base):
+
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month):
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def ensure_health_metric_partitions(conn, first, last):
+    # One partition per month from first's month through last's month, inclusive.
+    # A HealthMetric created before range partitioning is a plain table and stays usable
+    # as is; it picks up the partitioned layout on the next database reset.
+    is_partitioned = conn.exec_driver_sql(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('\"HealthMetric\"')"
+    ).first()
+    if is_partitioned is None:
+        logger.warning('HealthMetric is not a partitioned table; monthly partitions not created')
+        return
+
+    month = _month_start(first)
+    while month <= _month_start(last):
+        end = _next_month(month)
+        try:
+            with conn.begin_nested():
+                conn.exec_driver_sql(
+                    f'CREATE TABLE IF NOT EXISTS "HealthMetric_{month:%Y%m}" PARTITION OF "HealthMetric" '
+                    f"FOR VALUES FROM ('{month}') TO ('{end}')"
+                )
+        except DBAPIError as e:
+            # check_violation: the default partition already holds rows for this month.
+            # They have to be moved out by hand before the partition can be attached.
+            if getattr(e.orig, 'pgcode', None) != CHECK_VIOLATION:
+                raise
+            logger.warning(
+                'HealthMetric_default already holds rows for %s; partition HealthMetric_%s not created',
+                f'{month:%Y-%m}', f'{month:%Y%m}',
+            )
+        month = end
+
+
+def _month_bounds(conn, values):
+    # First and last month the given timestamps fall in, or None. Strings (CSV rows) that
+    # aren't ISO formatted are cast by the server, so any value the load accepts counts.
+    months, unparsed = set(), set()
+    for value in values:
+        if isinstance(value, str):
+            if not value.strip():
+                continue
+            try:
+                value = datetime.fromisoformat(value.strip())
+            except ValueError:
+                unparsed.add(value)
+                continue
+        if value is not None:
+            months.add(_month_start(value))
+
+    if unparsed:
+        low, high = conn.exec_driver_sql(
+            "SELECT min(date_trunc('month', v::timestamp))::date, max(date_trunc('month', v::timestamp))::date "
+            "FROM unnest(%(values)s::text[]) AS v",
+            {'values': list(unparsed)},
+        ).one()
+        months.update((low, high))
+
+    if not months:
+        return None
+    return min(months), max(months)
+
+
+def ensure_partitions_for_rows(conn, model, rows):
+    # Bulk loads skip the ORM, so the partitions their rows belong in are created first;
+    # rows that land in HealthMetric_default keep their month from ever being partitioned
+    if model is not HealthMetric or conn.dialect.name != 'postgresql':
+        return
+    bounds = _month_bounds(conn, (row.get('timestamp') for row in rows))
+    if bounds is not None:
+        ensure_health_metric_partitions(conn, *bounds)
+
+
+class Room(ReprMixin, Base):
     __tablename__ = 'Room'
-    
-    room_id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(50), unique=True, nullable=False)
-    capacity = Column(Integer, nullable=False)
-    
- 
-    classes = relationship("Class", back_populates="room")
-    
-    
+
+    room_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    name: Mapped[str] = mapped_column(String(50), unique=True)
+    capacity: Mapped[int] = mapped_column(Integer)
+
+
+    classes: Mapped[List["Class"]] = relationship(back_populates="room", lazy="raise_on_sql", init=False)
+
+
     __table_args__ = (
         CheckConstraint('capacity > 0', name='check_capacity_positive'),
     )
-    
-    def __repr__(self):
-        return f"<Room(id={self.room_id}, name='{self.name}', capacity={self.capacity})>"
 
 
-class Class(Base):
+class Class(ReprMixin, Base):
     __tablename__ = 'Class'
-    
-    class_id = Column(Integer, primary_key=True, autoincrement=True)
-    trainer_id = Column(Integer, ForeignKey('Trainer.trainer_id', ondelete='RESTRICT'), nullable=False)
-    room_id = Column(Integer, ForeignKey('Room.room_id', ondelete='RESTRICT'), nullable=False)
-    class_name = Column(String(100), nullable=False)
-    class_time = Column(DateTime, nullable=False)
-    capacity = Column(Integer, nullable=False)
-    
-   
-    trainer = relationship("Trainer", back_populates="classes")
-    room = relationship("Room", back_populates="classes")
-    enrollments = relationship("ClassEnrollment", back_populates="class_obj", cascade="all, delete-orphan")
-    
-    
+
+    class_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    trainer_id: Mapped[int] = mapped_column(Integer, ForeignKey('Trainer.trainer_id', ondelete='RESTRICT'))
+    room_id: Mapped[int] = mapped_column(Integer, ForeignKey('Room.room_id', ondelete='RESTRICT'))
+    class_name: Mapped[str] = mapped_column(String(100))
+    class_time: Mapped[datetime] = mapped_column(DateTime)
+    capacity: Mapped[int] = mapped_column(Integer)
+
+
+    trainer: Mapped["Trainer"] = relationship(back_populates="classes", lazy="raise_on_sql", init=False)
+    room: Mapped["Room"] = relationship(back_populates="classes", lazy="raise_on_sql", init=False)
+    enrollments: Mapped[List["ClassEnrollment"]] = relationship(back_populates="class_obj", cascade="all, delete-orphan", passive_deletes=True, lazy="raise_on_sql", init=False)
+
+
     __table_args__ = (
         CheckConstraint('capacity > 0', name='check_class_capacity_positive'),
         UniqueConstraint('room_id', 'class_time', name='uq_room_time'),
+        Index('ix_class_trainer_time', 'trainer_id', 'class_time'),
     )
-    
-    def __repr__(self):
-        return f"<Class(id={self.class_id}, name='{self.class_name}', time={self.class_time})>"
 
 
-class PTSession(Base):
+class PTSession(ReprMixin, Base):
     __tablename__ = 'PTSession'
-    
-    session_id = Column(Integer, primary_key=True, autoincrement=True)
-    member_id = Column(Integer, ForeignKey('Member.member_id', ondelete='CASCADE'), nullable=False)
-    trainer_id = Column(Integer, ForeignKey('Trainer.trainer_id', ondelete='RESTRICT'), nullable=False)
-    session_time = Column(DateTime, nullable=False)
-    status = Column(String(20), nullable=False, default='scheduled')
-    
- 
-    member = relationship("Member", back_populates="pt_sessions")
-    trainer = relationship("Trainer", back_populates="pt_sessions")
-    
-   
+
+    session_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    member_id: Mapped[int] = mapped_column(Integer, ForeignKey('Member.member_id', ondelete='CASCADE'))
+    trainer_id: Mapped[int] = mapped_column(Integer, ForeignKey('Trainer.trainer_id', ondelete='RESTRICT'))
+    session_time: Mapped[datetime] = mapped_column(DateTime)
+    status: Mapped[str] = mapped_column(PT_SESSION_STATUS, server_default=text("'scheduled'"), init=False)
+
+
+    member: Mapped["Member"] = relationship(back_populates="pt_sessions", lazy="raise_on_sql", init=False)
+    trainer: Mapped["Trainer"] = relationship(back_populates="pt_sessions", lazy="raise_on_sql", init=False)
+
+
     __table_args__ = (
         UniqueConstraint('trainer_id', 'session_time', name='uq_trainer_time'),
         Index('idx_ptsession_trainer_time', 'trainer_id', 'session_time'),
+        Index('idx_ptsession_member_time', 'member_id', 'session_time'),
+        Index('idx_ptsession_scheduled_time', 'session_time', postgresql_where=text("status = 'scheduled'")),
     )
-    
-    def __repr__(self):
-        return f"<PTSession(id={self.session_id}, member_id={self.member_id}, trainer_id={self.trainer_id}, time={self.session_time})>"
 
 
-class ClassEnrollment(Base):
+class ClassEnrollment(BulkInsertMixin, ReprMixin, Base):
     __tablename__ = 'ClassEnrollment'
-    
-    enrollment_id = Column(Integer, primary_key=True, autoincrement=True)
-    member_id = Column(Integer, ForeignKey('Member.member_id', ondelete='CASCADE'), nullable=False)
-    class_id = Column(Integer, ForeignKey('Class.class_id', ondelete='CASCADE'), nullable=False)
-    enrollment_date = Column(DateTime, nullable=False, default=datetime.now)
-    
-    member = relationship("Member", back_populates="class_enrollments")
-    class_obj = relationship("Class", back_populates="enrollments")
-    
+
+    enrollment_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    member_id: Mapped[int] = mapped_column(Integer, ForeignKey('Member.member_id', ondelete='CASCADE'))
+    class_id: Mapped[int] = mapped_column(Integer, ForeignKey('Class.class_id', ondelete='CASCADE'))
+    enrollment_date: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), init=False)
+    # Denormalized copy of Class.trainer_id for trainer-scoped rosters without a join.
+    # Filled and kept in sync by the trg_enrollment_trainer / trg_class_trainer_sync triggers.
+    trainer_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('Trainer.trainer_id', ondelete='RESTRICT'), server_default=FetchedValue(), init=False
+    )
+
+    member: Mapped["Member"] = relationship(back_populates="class_enrollments", lazy="raise_on_sql", init=False)
+    class_obj: Mapped["Class"] = relationship(back_populates="enrollments", lazy="raise_on_sql", init=False)
+
     __table_args__ = (
         UniqueConstraint('member_id', 'class_id', name='uq_member_class'),
+        Index('ix_enrollment_class', 'class_id'),
+        Index('idx_enroll_trainer_date', 'trainer_id', 'enrollment_date'),
+    )
+
+
+# One-off upgrade for a ClassEnrollment created before trainer_id existed; run only when
+# the column is missing, since SET NOT NULL locks the table and rescans it
+ENROLLMENT_TRAINER_MIGRATION_SQL = """
+ALTER TABLE "ClassEnrollment"
+    ADD COLUMN IF NOT EXISTS trainer_id INTEGER REFERENCES "Trainer" (trainer_id) ON DELETE RESTRICT;
+
+UPDATE "ClassEnrollment" AS e
+SET trainer_id = c.trainer_id
+FROM "Class" AS c
+WHERE c.class_id = e.class_id AND e.trainer_id IS NULL;
+
+ALTER TABLE "ClassEnrollment" ALTER COLUMN trainer_id SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_enroll_trainer_date ON "ClassEnrollment" (trainer_id, enrollment_date);
+"""
+
+# ClassEnrollment.trainer_id mirrors Class.trainer_id: copied on insert, re-synced when a
+# class changes trainer. Idempotent, so it is safe to re-run at startup.
+ENROLLMENT_TRAINER_SQL = """
+CREATE OR REPLACE FUNCTION set_enrollment_trainer()
+RETURNS TRIGGER AS $$
+BEGIN
+    SELECT trainer_id INTO NEW.trainer_id
+    FROM "Class"
+    WHERE class_id = NEW.class_id;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_enrollment_trainer ON "ClassEnrollment";
+
+CREATE TRIGGER trg_enrollment_trainer
+BEFORE INSERT OR UPDATE OF class_id ON "ClassEnrollment"
+FOR EACH ROW
+EXECUTE FUNCTION set_enrollment_trainer();
+
+CREATE OR REPLACE FUNCTION sync_class_trainer()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE "ClassEnrollment"
+    SET trainer_id = NEW.trainer_id
+    WHERE class_id = NEW.class_id;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_class_trainer_sync ON "Class";
+
+CREATE TRIGGER trg_class_trainer_sync
+AFTER UPDATE OF trainer_id ON "Class"
+FOR EACH ROW
+WHEN (OLD.trainer_id IS DISTINCT FROM NEW.trainer_id)
+EXECUTE FUNCTION sync_class_trainer();
+"""
+
+# Installed with the table so a plain metadata.create_all() schema accepts inserts too
+event.listen(
+    ClassEnrollment.__table__,
+    'after_create',
+    DDL(ENROLLMENT_TRAINER_SQL).execute_if(dialect='postgresql'),
+)
+
+
+# Statement factories for hot query shapes. lambda_stmt caches the built and compiled
+# statement per call site; the closure variables become bound parameters.
+
+def latest_metric_stmt(member_id):
+    # DISTINCT ON lets Postgres stop at the first row of ix_healthmetric_member_ts
+    return lambda_stmt(
+        lambda: select(HealthMetric)
+        .distinct(HealthMetric.member_id)
+        .where(HealthMetric.member_id == member_id)
+        .order_by(HealthMetric.member_id, HealthMetric.timestamp.desc())
+    )
+
+
+def member_metrics_stmt(member_id, metric_type, start, end):
+    # Mapped classes can't take __slots__ (instrumented attributes live on the class), so
+    # time-window reads return slotted Row tuples instead of entities: no __dict__, no
+    # instance state, nothing held in the identity map, and all columns come from
+    # ix_healthmetric_member_ts
+    return lambda_stmt(
+        lambda: select(HealthMetric.metric_id, HealthMetric.metric_value, HealthMetric.timestamp)
+        .where(HealthMetric.member_id == member_id)
+        .where(HealthMetric.metric_type == metric_type)
+        .where(HealthMetric.timestamp.between(start, end))
+        .order_by(HealthMetric.timestamp)
+    )
+
+
+def upcoming_sessions_stmt(member_id, after):
+    return lambda_stmt(
+        lambda: select(PTSession)
+        .where(PTSession.member_id == member_id)
+        .where(PTSession.session_time > after)
+        .order_by(PTSession.session_time)
     )
-    
-    def __repr__(self):
-        return f"<ClassEnrollment(id={self.enrollment_id}, member_id={self.member_id}, class_id={self.class_id})>"